@@ -3,61 +3,100 @@ import csv
 import json
 import os
 import sys
+from operator import itemgetter
 
-def extract_abs_rankings(csv_file_path, output_file='abs_rankings.json'):
+from extract_cache import load_cached_json, save_cached_json
+from extract_utils import CSV_BUFFER_SIZE, json_bytes, pa, pa_csv, pc
+
+def read_abs_rows(csv_file_path):
     """
-    Extracts ABS rankings from a CSV file and creates a dictionary.
+    Reads the title (2nd) and ABS rank (3rd) columns from the ABS CSV file.
+    Uses pyarrow when it is installed, and the csv module otherwise or when pyarrow
+    cannot parse the file (rows with a different number of fields).
     
     Args:
         csv_file_path: Path to the CSV file
-        output_file: Path to save the JSON output (optional)
     
     Returns:
-        Dictionary with journal titles (lowercase) as keys and dict with ABS Ranking
+        Iterable of (title, rank) tuples, header excluded. Titles are lowercase and
+        both values are stripped of surrounding whitespace.
     """
-    abs_dict = {}
-    
-    with open(csv_file_path, 'r', encoding='utf-8') as file:
+    if pa_csv is not None:
+        try:
+            # Only the two needed columns are converted; the header line is skipped
+            table = pa_csv.read_csv(
+                csv_file_path,
+                read_options=pa_csv.ReadOptions(skip_rows=1, autogenerate_column_names=True),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=['f1', 'f2'],
+                    column_types={'f1': pa.string(), 'f2': pa.string()}))
+        except pa.ArrowInvalid:
+            # Ragged rows (e.g. an extra trailing field) are read by the csv module below
+            table = None
+
+        if table is not None:
+            # Strip the whole columns at once. Titles are lowercased by str.lower(), which
+            # differs from pc.utf8_lower for some characters (e.g. 'İ')
+            titles = pc.utf8_trim_whitespace(table.column('f1'))
+            ranks = pc.utf8_trim_whitespace(table.column('f2'))
+            return list(zip((title.lower() for title in titles.to_pylist()), ranks.to_pylist()))
+
+    with open(csv_file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE) as file:
         # CSV here uses , as delimiter
         reader = csv.reader(file, delimiter=',')
         header=next(reader) # Skip the first line that contains the headers
 
-        for row in reader:        
-            title = row[1].strip().lower()
-            rank = row[2].strip()
+        # itemgetter picks the title and rank fields of each row in C
+        return [(title.strip().lower(), rank.strip()) for title, rank in map(itemgetter(1, 2), reader)]
 
-            abs_dict[title] = {'abs': rank}
+def extract_abs_rankings(csv_file_path, output_file='abs_rankings.json', js_output_file='abs_rankings.js'):
+    """
+    Extracts ABS rankings from a CSV file and creates a dictionary.
+    The JSON and JavaScript files are written from a single serialization, which is also
+    cached next to output_file and reused as long as the CSV file is not modified.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        output_file: Path to save the JSON output (optional)
+        js_output_file: Path to save the JavaScript output (optional)
+    
+    Returns:
+        Dictionary with journal titles (lowercase) as keys and the ABS Ranking as values.
+        The {"abs": ...} objects of the output files are only built when writing.
+    """
+    # Skip parsing the CSV when it did not change since the last run
+    abs_json = load_cached_json(csv_file_path, output_file) if output_file else None
 
+    if abs_json is not None:
+        print(f"{csv_file_path} is unchanged, using the cached rankings")
+        abs_dict = {title: data['abs'] for title, data in json.loads(abs_json).items()}
+    else:
+        # Built in one comprehension; a title listed twice keeps its last rank
+        abs_dict = {title: rank for title, rank in read_abs_rows(csv_file_path)}
+
+        # Serialize once, the same JSON is used for both output files
+        if output_file or js_output_file:
+            abs_json = json_bytes({title: {'abs': rank} for title, rank in abs_dict.items()})
+        if output_file:
+            save_cached_json(csv_file_path, output_file, abs_json)
+    
     print(f"{len(abs_dict)} journal added\n")
 
     # Save to JSON file
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(abs_dict, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(abs_json)
         print(f"ABS rankings saved in {output_file}\n")
 
-    return abs_dict
-
-def generate_javascript_dict(abs_dict, output_file = 'abs_rankings.js'):
-    """
-    Generate a JavaScript file with the |ABS rankings dictionary.
-    
-    Args:
-        abs_dict: Dictionary with journal titles and ABS data
-        output_file: Path to save the JavaScript file
-    """
+    # Save as JavaScript object, any JSON object is a valid JavaScript expression
+    if js_output_file:
+        with open(js_output_file, 'wb') as f:
+            f.write(b'var abs_rankings = ')
+            f.write(abs_json)
+            f.write(b';\n')
+        print(f"ABS JavaScript dictionary saved to {js_output_file}")
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('var abs_rankings = {\n')
-        
-        for i, (title, data) in enumerate(sorted(abs_dict.items())):
-            # Add comma for all lines except the last one
-            comma = ',' if i < len(abs_dict) - 1 else ''
-            f.write(f'    "{title}": {{abs: "{data["abs"]}"}}{comma}\n')
-        
-        f.write('};\n')
-    
-    print(f"ABS JavaScript dictionary saved to {output_file}")
+    return abs_dict
 
 
 
@@ -81,13 +120,10 @@ if __name__ == "__main__":
     
     print(f"Found {len(abs_dict)} journals with rankings\n")
     
-    # Generate JavaScript file
-    generate_javascript_dict(abs_dict)
-    
     # Print some sample entries
     print("\nSample entries:")
-    for i, (title, data) in enumerate(list(abs_dict.items())[:5]):
-        print(f"  {title}: ABS={data['abs']}")
+    for i, (title, rank) in enumerate(list(abs_dict.items())[:5]):
+        print(f"  {title}: ABS={rank}")
 
 
 
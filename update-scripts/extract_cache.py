@@ -0,0 +1,58 @@
+import gzip
+import os
+
+# Stored in every stamp; bump it whenever the extraction or the JSON it produces changes,
+# so caches written by older scripts are not reused
+CACHE_VERSION = 2
+
+def csv_stamp(csv_file_path):
+    """
+    Build the stamp identifying a CSV file: cache version, resolved path, size and
+    modification time. Raises FileNotFoundError when the CSV file does not exist.
+    """
+    stat = os.stat(csv_file_path)
+    return '\n'.join([
+        f'version {CACHE_VERSION}',
+        os.path.realpath(csv_file_path),
+        str(stat.st_size),
+        str(stat.st_mtime_ns),
+    ])
+
+def load_cached_json(csv_file_path, output_file):
+    """
+    Load the JSON saved by save_cached_json for output_file, if it was extracted from the
+    same, unmodified CSV file by the current cache version.
+
+    Args:
+        csv_file_path: Path to the CSV file the rankings are extracted from
+        output_file: Path of the JSON output the cache belongs to
+
+    Returns:
+        The cached UTF-8 encoded JSON, or None when there is no up-to-date cache
+    """
+    try:
+        with open(output_file + '.stamp', 'r', encoding='utf-8') as f:
+            stamp = f.read()
+        if stamp != csv_stamp(csv_file_path):
+            return None
+        with gzip.open(output_file + '.gz', 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def save_cached_json(csv_file_path, output_file, json_data):
+    """
+    Save the JSON extracted from a CSV file as output_file.gz, along with the stamp of
+    the CSV file (see csv_stamp) in output_file.stamp.
+
+    Args:
+        csv_file_path: Path to the CSV file the rankings were extracted from
+        output_file: Path of the JSON output the cache belongs to
+        json_data: UTF-8 encoded JSON to cache
+    """
+    with gzip.open(output_file + '.gz', 'wb') as f:
+        f.write(json_data)
+
+    # Written last, so an interrupted run never leaves a stamp for a partial cache
+    with open(output_file + '.stamp', 'w', encoding='utf-8') as f:
+        f.write(csv_stamp(csv_file_path))
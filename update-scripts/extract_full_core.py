@@ -1,86 +1,197 @@
 import csv
 import json
-import os
+from collections import Counter
+from operator import itemgetter
 
-def extract_full_core_rankings(csv_file='full_CORE.csv'):
+from extract_cache import load_cached_json, save_cached_json
+from extract_utils import CSV_BUFFER_SIZE, json_bytes, pa, pa_csv, pc
+
+# Main CORE ranks, stored together with the edition they come from
+MAIN_RANKS = ['A*', 'A', 'B', 'C']
+
+def read_core_table(csv_file='full_CORE.csv'):
     """
-    Extract comprehensive CORE conference rankings from full CSV file.
-    Includes: Main CORE ranks (A*, A, B, C), Australasian, and National rankings.
-    Also includes historical data (2021, 2023 editions).
+    Read the title, 2023 rank and 2021 rank columns from the full CORE CSV file with pyarrow.
+    Rows with fewer than 9 fields are reported and skipped.
+    Returns a pyarrow Table with the columns title, rank_2023 and rank_2021, or None when
+    some rows have more than 9 fields; those are kept by the csv module reader instead.
+    """
+    ignored_rows = []
+
+    def handle_invalid_row(row):
+        # Longer rows abort the read, shorter ones are skipped like in read_core_rows
+        if row.actual_columns > row.expected_columns:
+            return 'error'
+        ignored_rows.append(row.text)
+        return 'skip'
+
+    # full_CORE does not have a header, columns are named f0..f8
+    columns = ['f1', 'f4', 'f5']
+    try:
+        table = pa_csv.read_csv(
+            csv_file,
+            read_options=pa_csv.ReadOptions(column_names=[f'f{i}' for i in range(9)]),
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=handle_invalid_row),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={name: pa.string() for name in columns}))
+    except pa.ArrowInvalid:
+        return None
+
+    for text in ignored_rows:
+        print(f"Ignored row: [{text}]")
+    return table.select(columns).rename_columns(['title', 'rank_2023', 'rank_2021'])
+
+def rank_core_table(table):
+    """
+    Vectorized version of rank_core_rows: classifies all conferences with pyarrow compute
+    kernels instead of a Python loop.
     Returns a dictionary mapping conference names to their rankings.
     """
-    core_rankings = {}
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
+    conference_names = pc.utf8_trim_whitespace(table.column('title'))
+    rank_2023 = pc.utf8_trim_whitespace(table.column('rank_2023'))
+    rank_2021 = pc.utf8_trim_whitespace(table.column('rank_2021'))
+
+    # Primary ranking: use 2023, fall back to 2021
+    has_2023 = pc.not_equal(rank_2023, '')
+    primary_rank = pc.if_else(has_2023, rank_2023, rank_2021)
+    edition = pc.if_else(has_2023, '2023', '2021')
+
+    # The first matching condition gives the stored ranking, other rows stay null
+    rankings = pc.case_when(
+        pc.make_struct(
+            pc.is_in(primary_rank, value_set=pa.array(MAIN_RANKS)),
+            pc.starts_with(primary_rank, 'Australasian'),
+            pc.starts_with(primary_rank, 'National'),
+            pc.equal(primary_rank, 'TBR')),
+        pc.binary_join_element_wise(primary_rank, ' [', edition, ']', ''),
+        pc.replace_substring(primary_rank, 'Australasian', 'Au'),
+        pc.replace_substring(primary_rank, 'National', 'Nat'),
+        primary_rank)
+
+    keep = pc.and_(pc.is_valid(rankings), pc.not_equal(conference_names, ''))
+    return dict(zip(conference_names.filter(keep).to_pylist(), rankings.filter(keep).to_pylist()))
+
+def _has_all_fields(row):
+    """csv fallback filter: report and skip rows with fewer than 9 fields."""
+    if len(row) < 9:
+        print(f"Ignored row: [{row}]")
+        return False
+    return True
+
+def read_core_rows(csv_file='full_CORE.csv'):
+    """
+    Read the title, 2023 rank and 2021 rank columns from the full CORE CSV file with the csv module.
+    Rows with fewer than 9 fields are reported and skipped.
+    Returns a list of (title, rank_2023, rank_2021) tuples.
+    """
+    with open(csv_file, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE) as f:
         reader = csv.reader(f)
         # header = next(reader)  # full_CORE does not hava a header
+
+        # itemgetter picks the title and rank fields of each complete row in C
+        return list(map(itemgetter(1, 4, 5), filter(_has_all_fields, reader)))
+
+def rank_core_rows(rows):
+    """
+    Classify (title, rank_2023, rank_2021) rows into CORE rankings.
+    Returns a dictionary mapping conference names to their rankings.
+    """
+    core_rankings = {}
+    
+    for conference_name, rank_2023, rank_2021 in rows:
+        # Extract fields
+        conference_name = conference_name.strip()  # Title
+        rank_2023 = rank_2023.strip()  # 2023 Rank
+        rank_2021 = rank_2021.strip()  # 2021 Rank
+        
+        if not conference_name:
+            continue
         
+        # Primary ranking: use 2023, fall back to 2021
+        primary_rank = rank_2023 if rank_2023 else rank_2021
+        
+        # Store the primary ranking with edition info
+        if primary_rank in MAIN_RANKS:
+            edition = '2023' if rank_2023 else '2021'
+            core_rankings[conference_name] = f"{primary_rank} [{edition}]"
+        # Australasian rankings
+        elif primary_rank.startswith('Australasian'):
+            core_rankings[conference_name] = primary_rank.replace('Australasian', 'Au')
+        # National rankings  
+        elif primary_rank.startswith('National'):
+            core_rankings[conference_name] = primary_rank.replace('National', 'Nat')
+        # TBR (To Be Ranked)
+        elif primary_rank == 'TBR':
+            core_rankings[conference_name] = 'TBR'
+    
+    return core_rankings
+
+def extract_full_core_rankings(csv_file='full_CORE.csv'):
+    """
+    Extract comprehensive CORE conference rankings from full CSV file.
+    Includes: Main CORE ranks (A*, A, B, C), Australasian, and National rankings.
+    Also includes historical data (2021, 2023 editions).
+    Uses pyarrow when it is installed, and the csv module otherwise or when some rows
+    have more than 9 fields.
+    The rankings are cached next to core_rankings.json and reused as long as the CSV file is not modified.
+    Returns a dictionary mapping conference names to their rankings, or None when the
+    CSV file does not exist.
+    """
+    # Skip parsing the CSV when it did not change since the last run
+    core_json = load_cached_json(csv_file, 'core_rankings.json')
+
+    if core_json is not None:
+        print(f"{csv_file} is unchanged, using the cached rankings\n")
+        core_rankings = json.loads(core_json)
+    else:
         print("CSV Header: The file does not have a header")
         print("\nProcessing conferences...\n")
         
-        for row in reader:
-            if len(row) < 9:
-                print(f"Ignored row: [{row}]")
-                continue
-            
-            # Extract fields
-            conference_name = row[1].strip()  # Title
-            rank_2023 = row[4].strip()  # 2023 Rank
-            rank_2021 = row[5].strip()  # 2021 Rank
-            
-            if not conference_name:
-                continue
-            
-            # Primary ranking: use 2023, fall back to 2021
-            primary_rank = rank_2023 if rank_2023 else rank_2021
-            
-            # Store the primary ranking with edition info
-            if primary_rank in ['A*', 'A', 'B', 'C']:
-                edition = '2023' if rank_2023 else '2021'
-                core_rankings[conference_name] = f"{primary_rank} [{edition}]"
-            # Australasian rankings
-            elif primary_rank.startswith('Australasian'):
-                core_rankings[conference_name] = primary_rank.replace('Australasian', 'Au')
-            # National rankings  
-            elif primary_rank.startswith('National'):
-                core_rankings[conference_name] = primary_rank.replace('National', 'Nat')
-            # TBR (To Be Ranked)
-            elif primary_rank == 'TBR':
-                core_rankings[conference_name] = 'TBR'
+        # Only a missing CSV is reported here, other missing files keep their own error
+        try:
+            table = read_core_table(csv_file) if pa_csv is not None else None
+            rows = read_core_rows(csv_file) if table is None else None
+        except FileNotFoundError:
+            print('!!! Import file does not exist')
+            return None
+
+        if table is not None:
+            core_rankings = rank_core_table(table)
+        else:
+            core_rankings = rank_core_rows(rows)
+
+        # Serialize once, the same JSON is used for both output files
+        core_json = json_bytes(core_rankings)
+        save_cached_json(csv_file, 'core_rankings.json', core_json)
     
     print(f"Total conferences extracted: {len(core_rankings)}")
     
     # Count by rank
-    rank_counts = {}
-    for rank in core_rankings.values():
-        base_rank = rank.split()[0]  # Get 'A*', 'A', 'B', etc.
-        rank_counts[base_rank] = rank_counts.get(base_rank, 0) + 1
+    rank_counts = Counter(rank.partition(' ')[0] for rank in core_rankings.values())  # 'A*', 'A', 'B', etc.
     
     print("\nRanking distribution:")
     for rank in sorted(rank_counts.keys()):
         print(f"  {rank}: {rank_counts[rank]}")
     
     # Save to JSON file
-    with open('core_rankings.json', 'w', encoding='utf-8') as f:
-        json.dump(core_rankings, f, indent=2, ensure_ascii=False)
+    with open('core_rankings.json', 'wb') as f:
+        f.write(core_json)
     
     # Save as JavaScript object
-    with open('core_rankings.js', 'w', encoding='utf-8') as f:
-        f.write('var coreRankings = ')
-        json.dump(core_rankings, f, indent=2, ensure_ascii=False)
-        f.write(';\n')
+    with open('core_rankings.js', 'wb') as f:
+        f.write(b'var coreRankings = ')
+        f.write(core_json)
+        f.write(b';\n')
     
     print(f"\nSaved to core_rankings.json and core_rankings.js")
     
     return core_rankings
 
 if __name__ == '__main__':
+    # Opening the CSV is the existence check, a missing file is reported by the extraction
     rankings = extract_full_core_rankings()
-
-    if os.path.exists('full_CORE.csv'):
-        print('Import file exists')
-    else:
-        print('!!! Import file does not exist')
+    if rankings is None:
         exit()
     
     
@@ -98,7 +209,7 @@ if __name__ == '__main__':
     }
     
     for conf, rank in rankings.items():
-        base_rank = rank.split()[0]
+        base_rank = rank.partition(' ')[0]
         if base_rank in categories and len(categories[base_rank]) < 3:
             categories[base_rank].append((conf, rank))
     
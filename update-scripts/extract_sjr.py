@@ -1,68 +1,155 @@
 import csv
 import json
 import os
+import re
 
-def extract_sjr_rankings(csv_file_path, output_file='sjr_rankings.json'):
+from extract_cache import load_cached_json, save_cached_json
+from extract_utils import CSV_BUFFER_SIZE, json_bytes, pa, pa_csv, pc
+
+# SJR values use comma as decimal separator
+COMMA_TO_DOT = str.maketrans(',', '.')
+
+# Plain decimal number, used to tell which SJR values can be cast to float
+# (float() alone would also accept nan and inf, which are not valid JSON)
+SJR_NUMBER_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+SJR_NUMBER_RE = re.compile(SJR_NUMBER_PATTERN)
+
+def read_sjr_rows(csv_file_path):
     """
-    Extract SJR rankings and quartiles from the scimagojr CSV file and create a dictionary.
+    Read the title, SJR value and best quartile columns from the scimagojr CSV file.
+    Uses pyarrow when it is installed, and the csv module otherwise or when pyarrow
+    cannot parse the file (rows with a different number of fields).
     
     Args:
         csv_file_path: Path to the scimagojr CSV file
-        output_file: Path to save the JSON output (optional)
     
     Returns:
-        Dictionary with journal titles (lowercase) as keys and dict with SJR + quartile as values
+        List of (title, sjr_value, sjr_float, quartile) tuples, where sjr_float is None when
+        the value could not be converted and sjr_value is then the raw SJR text.
+        Titles are lowercase and titles and quartiles are stripped of surrounding whitespace.
     """
-    sjr_dict = {}
-    
-    with open(csv_file_path, 'r', encoding='utf-8') as file:
+    if pa_csv is not None:
+        columns = ['Title', 'SJR', 'SJR Best Quartile']
+        parse_options = pa_csv.ParseOptions(delimiter=';')
+        try:
+            # Fast path: the CSV reader parses the SJR decimals natively while reading,
+            # with comma as decimal point. Empty values become null.
+            table = pa_csv.read_csv(
+                csv_file_path,
+                parse_options=parse_options,
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=columns,
+                    column_types={'Title': pa.string(), 'SJR': pa.float64(), 'SJR Best Quartile': pa.string()},
+                    decimal_point=',',
+                    null_values=['']))
+            sjr_floats = table.column('SJR')
+            if pc.any(pc.invert(pc.is_finite(sjr_floats))).as_py():
+                # The reader accepts nan and inf, convert them as text like the other values
+                raise pa.ArrowInvalid('SJR values that are not finite numbers')
+            sjr_values = pc.if_else(pc.is_valid(sjr_floats), pa.scalar(None, pa.string()), '')
+        except pa.ArrowInvalid:
+            # Some SJR values are not plain numbers, or some rows have a different number
+            # of fields: read every column as text instead
+            try:
+                table = pa_csv.read_csv(
+                    csv_file_path,
+                    parse_options=parse_options,
+                    convert_options=pa_csv.ConvertOptions(
+                        include_columns=columns,
+                        column_types={name: pa.string() for name in columns}))
+            except pa.ArrowInvalid:
+                # Ragged rows (e.g. an extra trailing field) are read by the csv module below
+                table = None
+            else:
+                # Convert the whole SJR column at once, handling comma as decimal separator.
+                # Values that are not numbers are nulled before the cast.
+                sjr_values = pc.utf8_trim_whitespace(table.column('SJR'))
+                dotted = pc.replace_substring(sjr_values, ',', '.')
+                is_number = pc.match_substring_regex(dotted, SJR_NUMBER_PATTERN)
+                sjr_floats = pc.cast(pc.if_else(is_number, dotted, None), pa.float64())
+
+        if table is not None:
+            # Strip the whole columns at once. Titles are lowercased by str.lower(), which
+            # differs from pc.utf8_lower for some characters (e.g. 'İ')
+            titles = pc.utf8_trim_whitespace(pc.utf8_trim(table.column('Title'), characters='"'))
+            quartiles = pc.utf8_trim_whitespace(table.column('SJR Best Quartile'))
+
+            return list(zip((title.lower() for title in titles.to_pylist()),
+                            sjr_values.to_pylist(),
+                            sjr_floats.to_pylist(),
+                            quartiles.to_pylist()))
+
+    rows = []
+    with open(csv_file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE) as file:
         # CSV uses semicolon as delimiter
         reader = csv.DictReader(file, delimiter=';')
         
         for row in reader:
-            title = row['Title'].strip('"').strip().lower()
             sjr_value = row['SJR'].strip()
-            quartile = row['SJR Best Quartile'].strip()
-
-            # Convert SJR value from string to float, handling comma as decimal separator
-            try:
-                sjr_float = float(sjr_value.replace(',', '.'))
-                # Store both SJR and quartile
-                sjr_dict[title] = {
-                    'sjr': sjr_float,
-                    'quartile': quartile if quartile else '-'
-                }
-            except ValueError:
-                print(f"Warning: Could not convert SJR value '{sjr_value}' for journal '{title}'")
-                continue
-    
-    # Save to JSON file if output_file is specified
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sjr_dict, f, indent=2, ensure_ascii=False)
-        print(f"SJR rankings saved to {output_file}")
-    
-    return sjr_dict
+            dotted = sjr_value.translate(COMMA_TO_DOT)
+            sjr_float = float(dotted) if SJR_NUMBER_RE.match(dotted) else None
+            title = row['Title'].strip('"').strip().lower()
+            rows.append((title, sjr_value, sjr_float, row['SJR Best Quartile'].strip()))
+    return rows
 
-def generate_javascript_dict(sjr_dict, output_file='sjr_rankings.js'):
+def extract_sjr_rankings(csv_file_path, output_file='sjr_rankings.json', js_output_file='sjr_rankings.js'):
     """
-    Generate a JavaScript file with the SJR rankings and quartiles dictionary.
+    Extract SJR rankings and quartiles from the scimagojr CSV file and create a dictionary.
+    The JSON and JavaScript files are written from a single serialization, which is also
+    cached next to output_file and reused as long as the CSV file is not modified.
     
     Args:
-        sjr_dict: Dictionary with journal titles and SJR data (sjr + quartile)
-        output_file: Path to save the JavaScript file
+        csv_file_path: Path to the scimagojr CSV file
+        output_file: Path to save the JSON output (optional)
+        js_output_file: Path to save the JavaScript output (optional)
+    
+    Returns:
+        Dictionary with journal titles (lowercase) as keys and (SJR, quartile) tuples as values.
+        The {"sjr": ..., "quartile": ...} objects of the output files are only built when writing.
     """
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('var sjr_rankings = {\n')
-        
-        for i, (title, data) in enumerate(sorted(sjr_dict.items())):
-            # Add comma for all lines except the last one
-            comma = ',' if i < len(sjr_dict) - 1 else ''
-            f.write(f'    "{title}": {{sjr: {data["sjr"]}, quartile: "{data["quartile"]}"}}{comma}\n')
+    # Skip parsing the CSV when it did not change since the last run
+    sjr_json = load_cached_json(csv_file_path, output_file) if output_file else None
+
+    if sjr_json is not None:
+        print(f"{csv_file_path} is unchanged, using the cached rankings")
+        sjr_dict = {title: (data['sjr'], data['quartile']) for title, data in json.loads(sjr_json).items()}
+    else:
+        rows = read_sjr_rows(csv_file_path)
+
+        for title, sjr_value, sjr_float, quartile in rows:
+            if sjr_float is None:
+                print(f"Warning: Could not convert SJR value '{sjr_value}' for journal '{title}'")
+
+        # Store both SJR and quartile, built in one comprehension; a title listed twice keeps its last values
+        sjr_dict = {
+            title: (sjr_float, quartile or '-')
+            for title, sjr_value, sjr_float, quartile in rows if sjr_float is not None
+        }
         
-        f.write('};\n')
+        # Serialize once, the same JSON is used for both output files
+        if output_file or js_output_file:
+            sjr_json = json_bytes({
+                title: {'sjr': sjr_float, 'quartile': quartile}
+                for title, (sjr_float, quartile) in sjr_dict.items()
+            })
+        if output_file:
+            save_cached_json(csv_file_path, output_file, sjr_json)
+
+    # Save to JSON file if output_file is specified
+    if output_file:
+        with open(output_file, 'wb') as f:
+            f.write(sjr_json)
+        print(f"SJR rankings saved to {output_file}")
+
+    # Save as JavaScript object, any JSON object is a valid JavaScript expression
+    if js_output_file:
+        with open(js_output_file, 'wb') as f:
+            f.write(b'var sjr_rankings = ')
+            f.write(sjr_json)
+            f.write(b';\n')
+        print(f"JavaScript dictionary saved to {js_output_file}")
     
-    print(f"JavaScript dictionary saved to {output_file}")
+    return sjr_dict
 
 if __name__ == "__main__":
     csv_file = "scimagojr 2024.csv"
@@ -78,10 +165,7 @@ if __name__ == "__main__":
     
     print(f"Found {len(sjr_dict)} journals with SJR rankings")
     
-    # Generate JavaScript file
-    generate_javascript_dict(sjr_dict)
-    
     # Print some sample entries
     print("\nSample entries:")
-    for i, (title, data) in enumerate(list(sjr_dict.items())[:5]):
-        print(f"  {title}: SJR={data['sjr']}, Quartile={data['quartile']}")
+    for i, (title, (sjr_float, quartile)) in enumerate(list(sjr_dict.items())[:5]):
+        print(f"  {title}: SJR={sjr_float}, Quartile={quartile}")
@@ -0,0 +1,24 @@
+import json
+
+try:
+    # Optional: pyarrow parses the CSV with a vectorized C++ reader
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = pc = pa_csv = None
+
+try:
+    # Optional: orjson is a compiled JSON encoder, much faster than the json module
+    import orjson
+except ImportError:
+    orjson = None
+
+# Read buffer for the csv module fallback (1 MiB instead of the default 8 KiB)
+CSV_BUFFER_SIZE = 1 << 20
+
+def json_bytes(obj):
+    """Serialize obj to compact UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,42 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from extract_abs import extract_abs_rankings
+from extract_full_core import extract_full_core_rankings
+from extract_sjr import extract_sjr_rankings
+
+def run_all(abs_csv_file='ABSRanking2024_Fulllist.csv', sjr_csv_file='scimagojr 2024.csv', core_csv_file='full_CORE.csv'):
+    """
+    Runs the ABS, SJR and CORE extractions in parallel, one process each.
+    Every extraction writes its own JSON and JavaScript files, so nothing is shared between processes.
+
+    Args:
+        abs_csv_file: Path to the ABS CSV file
+        sjr_csv_file: Path to the scimagojr CSV file
+        core_csv_file: Path to the full CORE CSV file
+
+    Returns:
+        Tuple with the ABS, SJR and CORE rankings dictionaries
+    """
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(extract_abs_rankings, abs_csv_file),
+            executor.submit(extract_sjr_rankings, sjr_csv_file),
+            executor.submit(extract_full_core_rankings, core_csv_file),
+        ]
+        return tuple(future.result() for future in futures)
+
+if __name__ == "__main__":
+    abs_csv_file = sys.argv[1] if len(sys.argv) > 1 else 'ABSRanking2024_Fulllist.csv'
+
+    for csv_file in (abs_csv_file, 'scimagojr 2024.csv', 'full_CORE.csv'):
+        if not os.path.exists(csv_file):
+            print(f'!!! Import file {csv_file} does not exist')
+            exit()
+
+    print("Extracting ABS, SJR and CORE rankings in parallel...\n")
+    abs_dict, sjr_dict, core_rankings = run_all(abs_csv_file)
+
+    print(f"\nFound {len(abs_dict)} ABS journals, {len(sjr_dict)} SJR journals and {len(core_rankings)} CORE conferences")
+    print("Run generate_data_js.py to combine them into the plugin data file")